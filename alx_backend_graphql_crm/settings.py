@@ -126,7 +126,11 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-GRAPHENE = {"SCHEMA": "alx_backend_graphql_crm.schema.schema"}
+GRAPHENE = {
+    "SCHEMA": "alx_backend_graphql_crm.schema.schema",
+    # Upper bound on nodes per connection page, applied as a SQL LIMIT
+    "RELAY_CONNECTION_MAX_LIMIT": 100,
+}
 
 # Cron jobs configuration
 CRONJOBS = [
@@ -17,6 +17,17 @@ app = Celery("crm")
 # Load configuration from Django settings
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
+# Worker tuning for I/O-bound tasks: each process reserves a single task and
+# acknowledges it only once finished, so a slow GraphQL/DB call never holds
+# other queued tasks hostage. Run workers with `-Ofair` to match.
+app.conf.update(
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_max_tasks_per_child=200,
+    worker_disable_rate_limits=True,
+)
+
 # Auto-discover tasks from all registered Django apps
 app.autodiscover_tasks()
 
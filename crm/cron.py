@@ -6,14 +6,21 @@ application health and perform automated operations.
 
 import os
 import sys
+import time
 import django
-from datetime import datetime
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+import requests
+from django.apps import apps
 
-# Set up Django environment
+# Set up Django environment when run outside an already configured process
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
-django.setup()
+if not apps.ready:
+    django.setup()
+
+from crm.graphql_client import GRAPHQL_URL
+from crm.tasks import restock_low_stock_products
+
+# Keep-alive HTTP session reused by every heartbeat in this process
+_SESSION = requests.Session()
 
 
 def log_crm_heartbeat():
@@ -27,29 +34,20 @@ def log_crm_heartbeat():
     Format: DD/MM/YYYY-HH:MM:SS CRM is alive
     """
     # Get current timestamp in the required format
-    timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
+    timestamp = time.strftime("%d/%m/%Y-%H:%M:%S", time.localtime())
 
     # Basic heartbeat message
     heartbeat_message = f"{timestamp} CRM is alive"
 
     # Try to query GraphQL endpoint to verify it's responsive
     try:
-        # Set up GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-
-        # Simple hello query to test endpoint
-        query = gql(
-            """
-            query {
-                hello
-            }
-        """
-        )
-
-        # Execute the query
-        result = client.execute(query)
-        hello_response = result.get("hello", "No response")
+        # Simple hello query posted directly, without building a GraphQL client
+        response = _SESSION.post(GRAPHQL_URL, json={"query": "{ hello }"}, timeout=1)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            raise Exception(payload["errors"][0].get("message"))
+        hello_response = (payload.get("data") or {}).get("hello", "No response")
 
         # Add GraphQL status to heartbeat message
         heartbeat_message += f" - GraphQL endpoint responsive: {hello_response}"
@@ -70,63 +68,29 @@ def log_crm_heartbeat():
 
 def update_low_stock():
     """
-    Execute the UpdateLowStockProducts mutation and log the results.
+    Restock low-stock products through Celery and log the results.
 
     This function:
-    1. Executes the UpdateLowStockProducts mutation via GraphQL endpoint
-    2. Logs updated product names and new stock levels to /tmp/low_stock_updates_log.txt
+    1. Queues the restock_low_stock_products Celery task and waits for its result
+    2. Logs the number of updated products to /tmp/low_stock_updates_log.txt
     """
     # Get current timestamp
-    timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
+    timestamp = time.strftime("%d/%m/%Y-%H:%M:%S", time.localtime())
 
     try:
-        # Set up GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-
-        # GraphQL mutation to update low-stock products
-        mutation = gql(
-            """
-            mutation {
-                updateLowStockProducts {
-                    updatedProducts {
-                        id
-                        name
-                        stock
-                    }
-                    message
-                    count
-                }
-            }
-        """
-        )
-
-        # Execute the mutation
-        result = client.execute(mutation)
-        mutation_result = result.get("updateLowStockProducts", {})
-
-        updated_products = mutation_result.get("updatedProducts", [])
-        message = mutation_result.get("message", "No response")
-        count = mutation_result.get("count", 0)
+        result = restock_low_stock_products.delay().get(timeout=30)
+        message = result.get("message", "No response")
 
         # Log the results
         log_entries = []
         log_entries.append(f"[{timestamp}] Low stock update executed: {message}")
 
-        if updated_products:
-            for product in updated_products:
-                product_name = product.get("name", "Unknown")
-                new_stock = product.get("stock", "Unknown")
-                log_entries.append(
-                    f"[{timestamp}] Updated product: {product_name}, New stock: {new_stock}"
-                )
-        else:
+        if not result.get("count"):
             log_entries.append(f"[{timestamp}] No low-stock products found to update")
 
         # Write to log file
-        with open("/tmp/lowstockupdates_log.txt", "a") as log_file:
-            for entry in log_entries:
-                log_file.write(entry + "\n")
+        with open("/tmp/lowstockupdates_log.txt", "a", buffering=65536) as log_file:
+            log_file.write("\n".join(log_entries) + "\n")
 
     except Exception as e:
         # Log errors
@@ -4,72 +4,81 @@ import os
 import sys
 import django
 from datetime import datetime, timedelta
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+from django.utils import timezone
+from gql import gql
 
-# Add the project root to the Python path
-project_root = "/home/meyvn/Desktop/ProDev-Backend/alx-backend-graphql_crm"
-sys.path.append(project_root)
+# Add the project root (three levels up from this file) to the Python path
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Set up Django environment
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
 django.setup()
 
+from crm.graphql_client import get_client, iter_nodes
 
-def send_order_reminders():
-    """Query GraphQL endpoint for recent orders and log reminders."""
-
-    # Calculate date 7 days ago
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    seven_days_ago_str = seven_days_ago.isoformat()
-
-    # Set up GraphQL client
-    transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-    client = Client(transport=transport, fetch_schema_from_transport=True)
-
-    # GraphQL query to get orders from the last 7 days
-    query = gql(
-        """
-        query GetRecentOrders($orderDateGte: DateTime) {
-            allOrders(orderDateGte: $orderDateGte) {
-                id
-                orderDate
-                customer {
+# GraphQL query for orders from a given date, one page at a time
+_RECENT_ORDERS_QUERY = gql(
+    """
+    query GetRecentOrders($orderDateGte: DateTime, $first: Int, $after: String) {
+        allOrders(orderDate_Gte: $orderDateGte, first: $first, after: $after) {
+            edges {
+                node {
                     id
-                    name
-                    email
+                    orderDate
+                    customer {
+                        id
+                        name
+                        email
+                    }
+                    totalAmount
                 }
-                totalAmount
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
             }
         }
-    """
-    )
+    }
+"""
+)
+
+
+def send_order_reminders():
+    """Query GraphQL endpoint for recent orders and log reminders."""
+
+    # Timestamp for logging, formatted once per run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Calculate date 7 days ago (timezone-aware, serialized with its UTC offset)
+    seven_days_ago = timezone.now() - timedelta(days=7)
+    seven_days_ago_str = seven_days_ago.isoformat()
 
     try:
         # Execute the query
-        result = client.execute(
-            query, variable_values={"orderDateGte": seven_days_ago_str}
+        orders = iter_nodes(
+            get_client(),
+            _RECENT_ORDERS_QUERY,
+            "allOrders",
+            variable_values={"orderDateGte": seven_days_ago_str},
         )
-        orders = result.get("allOrders", [])
-
-        # Create timestamp for logging
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Log each order
-        with open("/tmp/order_reminders_log.txt", "a") as log_file:
-            for order in orders:
-                customer = order.get("customer", {})
-                order_id = order.get("id")
-                customer_email = customer.get("email", "N/A")
-
-                log_entry = f"[{timestamp}] Order ID: {order_id}, Customer Email: {customer_email}\n"
-                log_file.write(log_entry)
+        # Log each order with a single write
+        log_entries = "".join(
+            f"[{timestamp}] Order ID: {order.get('id')}, "
+            f"Customer Email: {(order.get('customer') or {}).get('email', 'N/A')}\n"
+            for order in orders
+        )
+        with open("/tmp/order_reminders_log.txt", "a", buffering=65536) as log_file:
+            log_file.write(log_entries)
 
         print("Order reminders processed!")
 
     except Exception as e:
         # Log errors
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with open("/tmp/order_reminders_log.txt", "a") as log_file:
             log_file.write(f"[{timestamp}] ERROR: {str(e)}\n")
         print(f"Error processing order reminders: {e}")
@@ -0,0 +1,79 @@
+"""
+Shared GraphQL client for the CRM scheduled jobs.
+
+The client is built lazily on first use and kept for the lifetime of the
+process, so repeated queries reuse one keep-alive HTTP connection instead of
+opening a new connection (and re-fetching the schema) on every call.
+"""
+
+from gql import Client
+from gql.transport.requests import RequestsHTTPTransport
+from graphene_django.settings import graphene_settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+GRAPHQL_URL = "http://localhost:8000/graphql"
+
+_CLIENT = None
+
+
+def get_client():
+    """
+    Return a connected GraphQL client session, creating it on first use.
+
+    Returns:
+        SyncClientSession: Session whose execute() reuses a pooled connection
+    """
+    global _CLIENT
+
+    if _CLIENT is None:
+        transport = RequestsHTTPTransport(url=GRAPHQL_URL, timeout=5)
+        client = Client(transport=transport, fetch_schema_from_transport=False)
+        session = client.connect_sync()
+
+        # Replace the default adapter with a small keep-alive pool that also
+        # retries transient connection failures
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        transport.session.mount("http://", adapter)
+        transport.session.mount("https://", adapter)
+
+        _CLIENT = session
+
+    return _CLIENT
+
+
+def iter_nodes(session, document, field, variable_values=None, page_size=None):
+    """
+    Yield every node of a paginated connection field, one page at a time.
+
+    The document must declare $first and $after variables, pass them to the
+    connection field and select its pageInfo { hasNextPage endCursor }.
+
+    Args:
+        session: Client or client session used to execute the document
+        document: Parsed gql document for the connection query
+        field: Name of the connection field in the response
+        variable_values: Extra variables for the query
+        page_size: Number of nodes requested per page; defaults to the
+            server's RELAY_CONNECTION_MAX_LIMIT
+
+    Yields:
+        dict: Each node of the connection
+    """
+    if page_size is None:
+        page_size = graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+    variables = dict(variable_values or {}, first=page_size, after=None)
+
+    while True:
+        connection = session.execute(document, variable_values=variables)[field]
+        for edge in connection["edges"]:
+            yield edge["node"]
+
+        page_info = connection["pageInfo"]
+        if not page_info["hasNextPage"]:
+            return
+        variables["after"] = page_info["endCursor"]
@@ -1,22 +1,39 @@
 from django.db import models
 from django.utils import timezone
-import re
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 
 # Create your models here.
 
 
+def is_valid_phone(phone):
+    """Return True if phone is formatted as +1XXXXXXXXXX or XXX-XXX-XXXX."""
+    if len(phone) != 12:
+        return False
+    if phone[:2] == "+1":
+        return phone[2:].isdecimal()
+    return (
+        phone[3] == "-"
+        and phone[7] == "-"
+        and phone[:3].isdecimal()
+        and phone[4:7].isdecimal()
+        and phone[8:].isdecimal()
+    )
+
+
 class Customer(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["created_at"])]
+
     def clean(self):
         super().clean()
         if self.phone:
-            if not re.match(r"^(\+1\d{10}|\d{3}-\d{3}-\d{4})$", self.phone):
+            if not is_valid_phone(self.phone):
                 raise ValidationError({"phone": "Invalid phone number format."})
 
     def __str__(self):
@@ -30,13 +47,17 @@ class Product(models.Model):
     stock = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["stock"])]
+
     def __str__(self):
         return self.name
 
 
 class Order(models.Model):
+    # Lookups by customer are served by the (customer, order_date) index
     customer = models.ForeignKey(
-        Customer, on_delete=models.CASCADE, related_name="orders"
+        Customer, on_delete=models.CASCADE, related_name="orders", db_index=False
     )
     products = models.ManyToManyField(Product, related_name="orders")
     order_date = models.DateTimeField(default=timezone.now)
@@ -45,9 +66,11 @@ class Order(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def update_total_amount(self):
-        self.total_amount = sum(product.price for product in self.products.all())
-        self.save()
+    class Meta:
+        indexes = [
+            models.Index(fields=["order_date"]),
+            models.Index(fields=["customer", "order_date"]),
+        ]
 
     def __str__(self):
         return f"Order {self.pk} by {self.customer.name}"
@@ -11,10 +11,12 @@ GraphQL mutations use dynamic parameter binding that Pylance cannot analyze stat
 import graphene
 from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
-from .models import Customer, Product, Order
+from .models import Customer, Product, Order, is_valid_phone
+from .services import bump_low_stock, crm_statistics
 from django.core.exceptions import ValidationError
-from django.db import transaction
-import re
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+from decimal import Decimal
 
 
 class CustomerType(DjangoObjectType):
@@ -61,6 +63,13 @@ class OrderType(DjangoObjectType):
             "order_date": ["gte", "lte"],
         }
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        # Join the customer and prefetch products wherever orders are
+        # resolved (allOrders, node lookups), so nested fields never query
+        # once per order.
+        return queryset.select_related("customer").prefetch_related("products")
+
 
 class CreateCustomerInput(graphene.InputObjectType):
     name = graphene.String(required=True)
@@ -78,19 +87,25 @@ class CreateCustomer(graphene.Mutation):
     @staticmethod
     def mutate(root, info, input):
         try:
-            if Customer.objects.filter(email=input.email).exists():
-                raise ValidationError("Email already exists.")
-
-            if input.phone and not re.match(
-                r"^(\+1\d{10}|\d{3}-\d{3}-\d{4})$", input.phone
-            ):
+            if input.phone and not is_valid_phone(input.phone):
                 raise ValidationError("Invalid phone number format.")
 
             customer = Customer(
-                name=input.name, email=input.email, phone=input.get("phone", "")
+                name=input.name, email=input.email, phone=input.phone or ""
             )
-            customer.full_clean()
-            customer.save()
+            # Email uniqueness is left to the unique constraint on INSERT, so
+            # concurrent creates with the same email cannot both pass a
+            # separate check. The savepoint keeps any enclosing transaction
+            # usable for the follow-up lookup below.
+            customer.full_clean(validate_unique=False)
+            try:
+                with transaction.atomic():
+                    customer.save()
+            except IntegrityError:
+                # Only report a duplicate email when that is what failed
+                if Customer.objects.filter(email=input.email).exists():
+                    raise ValidationError("Email already exists.")
+                raise
             return CreateCustomer(
                 customer=customer, message="Customer created successfully."
             )
@@ -107,38 +122,71 @@ class BulkCreateCustomers(graphene.Mutation):
 
     @staticmethod
     def mutate(root, info, input):
-        successful_customers = []
         error_messages = []
 
-        with transaction.atomic():
-            for i, customer_data in enumerate(input):
-                try:
-                    if Customer.objects.filter(email=customer_data.email).exists():
-                        raise ValidationError(
-                            f"Record {i+1}: Email '{customer_data.email}' already exists."
-                        )
-
-                    if customer_data.phone and not re.match(
-                        r"^(\+1\d{10}|\d{3}-\d{3}-\d{4})$", customer_data.phone
-                    ):
-                        raise ValidationError(
-                            f"Record {i+1}: Invalid phone number format for '{customer_data.phone}'."
-                        )
-
-                    customer = Customer(
+        # Look up all incoming emails with a single query
+        incoming_emails = [customer_data.email for customer_data in input]
+        existing_emails = set(
+            Customer.objects.filter(email__in=incoming_emails).values_list(
+                "email", flat=True
+            )
+        )
+
+        name_max_length = Customer._meta.get_field("name").max_length
+        email_max_length = Customer._meta.get_field("email").max_length
+
+        valid_customers = []
+        for i, customer_data in enumerate(input):
+            try:
+                if customer_data.email in existing_emails:
+                    raise ValidationError(
+                        f"Record {i+1}: Email '{customer_data.email}' already exists."
+                    )
+
+                if customer_data.phone and not is_valid_phone(customer_data.phone):
+                    raise ValidationError(
+                        f"Record {i+1}: Invalid phone number format for '{customer_data.phone}'."
+                    )
+
+                # Field checks done inline instead of full_clean(); uniqueness
+                # was already checked against existing_emails
+                if not customer_data.name or len(customer_data.name) > name_max_length:
+                    raise ValidationError(
+                        f"Name must be 1 to {name_max_length} characters long."
+                    )
+                if len(customer_data.email) > email_max_length:
+                    raise ValidationError(
+                        f"Email must be at most {email_max_length} characters long."
+                    )
+                validate_email(customer_data.email)
+
+                valid_customers.append(
+                    Customer(
                         name=customer_data.name,
                         email=customer_data.email,
-                        phone=customer_data.get("phone", ""),
-                    )
-                    customer.full_clean()
-                    customer.save()
-                    successful_customers.append(customer)
-                except ValidationError as e:
-                    error_messages.append(f"Record {i+1}: {e}")
-                except Exception as e:
-                    error_messages.append(
-                        f"Record {i+1}: An unexpected error occurred: {e}"
+                        phone=customer_data.phone or "",
                     )
+                )
+                # Reject later duplicates of this email within the same batch
+                existing_emails.add(customer_data.email)
+            except ValidationError as e:
+                error_messages.append(f"Record {i+1}: {e}")
+            except Exception as e:
+                error_messages.append(
+                    f"Record {i+1}: An unexpected error occurred: {e}"
+                )
+
+        with transaction.atomic():
+            successful_customers = Customer.objects.bulk_create(
+                valid_customers, batch_size=500
+            )
+
+        # Backends that cannot return rows from a bulk INSERT leave pk unset,
+        # so reload the new customers to give them their IDs
+        if valid_customers and not connection.features.can_return_rows_from_bulk_insert:
+            successful_customers = Customer.objects.filter(
+                email__in=[customer.email for customer in valid_customers]
+            ).order_by("pk")
 
         return BulkCreateCustomers(
             customers=successful_customers, errors=error_messages
@@ -190,76 +238,92 @@ class CreateOrder(graphene.Mutation):
     @staticmethod
     def mutate(root, info, input):
         try:
-            customer = Customer.objects.get(pk=input.customer_id)
-
             if not input.product_ids:
                 raise ValidationError("At least one product must be selected.")
 
-            products = Product.objects.filter(pk__in=input.product_ids)
-            if len(products) != len(input.product_ids):
+            try:
+                requested_ids = {int(pk) for pk in input.product_ids}
+            except (TypeError, ValueError):
+                raise ValidationError("Invalid product ID found.")
+            # Duplicate IDs collapse in the set, so reject them here
+            if len(requested_ids) != len(input.product_ids):
                 raise ValidationError("Invalid product ID found.")
 
+            # Validation reads run in the same transaction as the inserts, so
+            # the mutation costs a single BEGIN/COMMIT. No row locks are taken:
+            # orders do not change product stock.
             with transaction.atomic():
-                order = Order(customer=customer)
+                # Only check that the customer exists; the row is not needed
+                if not Customer.objects.filter(pk=input.customer_id).exists():
+                    raise Exception("Invalid customer ID.")
+
+                # Primary keys and prices are all that is needed to validate
+                # the IDs and compute the total; no ORDER BY is needed either
+                prices = dict(
+                    Product.objects.filter(pk__in=requested_ids)
+                    .order_by()
+                    .values_list("pk", "price")
+                )
+                missing_ids = requested_ids - prices.keys()
+                if missing_ids:
+                    raise ValidationError(f"Invalid product IDs: {sorted(missing_ids)}")
+
+                order = Order(
+                    customer_id=input.customer_id,
+                    total_amount=sum(prices.values(), Decimal("0.00")),
+                )
                 if input.order_date:
                     order.order_date = input.order_date
                 order.save()
-                order.products.set(products)
-                order.update_total_amount()
+                # The order is new, so its product links can be inserted
+                # directly; products.set() would first query existing links
+                OrderProduct = Order.products.through
+                OrderProduct.objects.bulk_create(
+                    [
+                        OrderProduct(order_id=order.pk, product_id=product_id)
+                        for product_id in prices
+                    ]
+                )
 
             return CreateOrder(order=order)
-        except Customer.DoesNotExist:
-            raise Exception("Invalid customer ID.")
         except ValidationError as e:
             raise Exception(str(e))
 
 
+class CRMStatistics(graphene.ObjectType):
+    total_customers = graphene.Int()
+    total_orders = graphene.Int()
+    total_revenue = graphene.Decimal()
+
+
 class Query(graphene.ObjectType):
     hello = graphene.String()
-    all_customers = graphene.List(
+    crm_statistics = graphene.Field(CRMStatistics)
+    # Filtering comes from each type's Meta.filter_fields and is applied in
+    # SQL, as is first/after pagination. Extra arguments are passed through
+    # `args` because DjangoFilterConnectionField reserves the order_by kwarg.
+    all_customers = DjangoFilterConnectionField(
         CustomerType,
-        name=graphene.String(),
-        email=graphene.String(),
-        created_at_gte=graphene.DateTime(),
-        created_at_lte=graphene.DateTime(),
-        phone_pattern=graphene.String(),
-        order_by=graphene.String(),
+        args={"phone_pattern": graphene.String(), "order_by": graphene.String()},
     )
-    all_products = graphene.List(
+    all_products = DjangoFilterConnectionField(
         ProductType,
-        name=graphene.String(),
-        price_gte=graphene.Decimal(),
-        price_lte=graphene.Decimal(),
-        stock_gte=graphene.Int(),
-        stock_lte=graphene.Int(),
-        low_stock=graphene.Boolean(),
-        order_by=graphene.String(),
+        args={"low_stock": graphene.Boolean(), "order_by": graphene.String()},
     )
-    all_orders = graphene.List(
-        OrderType,
-        customer_name=graphene.String(),
-        product_name=graphene.String(),
-        product_id=graphene.ID(),
-        total_amount_gte=graphene.Decimal(),
-        total_amount_lte=graphene.Decimal(),
-        order_date_gte=graphene.DateTime(),
-        order_date_lte=graphene.DateTime(),
-        order_by=graphene.String(),
+    all_orders = DjangoFilterConnectionField(
+        OrderType, args={"order_by": graphene.String()}
     )
 
     def resolve_hello(self, info):
         return "Hello from CRM GraphQL API!"
 
+    def resolve_crm_statistics(root, info):  # type: ignore[misc]
+        # Aggregated in SQL, so the response size does not grow with the data
+        return CRMStatistics(**crm_statistics())
+
     # GraphQL resolvers: 'root' parameter is intentional for GraphQL context
     def resolve_all_customers(root, info, **kwargs):  # type: ignore[misc]
-        filters = {
-            "name__icontains": kwargs.get("name"),
-            "email__icontains": kwargs.get("email"),
-            "created_at__gte": kwargs.get("created_at_gte"),
-            "created_at__lte": kwargs.get("created_at_lte"),
-        }
-        filters = {k: v for k, v in filters.items() if v is not None}
-        queryset = Customer.objects.filter(**filters)
+        queryset = Customer.objects.all()
 
         if "phone_pattern" in kwargs:
             queryset = queryset.filter(phone__startswith=kwargs["phone_pattern"])
@@ -270,15 +334,7 @@ class Query(graphene.ObjectType):
         return queryset
 
     def resolve_all_products(root, info, **kwargs):  # type: ignore[misc]
-        filters = {
-            "name__icontains": kwargs.get("name"),
-            "price__gte": kwargs.get("price_gte"),
-            "price__lte": kwargs.get("price_lte"),
-            "stock__gte": kwargs.get("stock_gte"),
-            "stock__lte": kwargs.get("stock_lte"),
-        }
-        filters = {k: v for k, v in filters.items() if v is not None}
-        queryset = Product.objects.filter(**filters)
+        queryset = Product.objects.all()
 
         if kwargs.get("low_stock"):
             queryset = queryset.filter(stock__lt=10)
@@ -289,17 +345,7 @@ class Query(graphene.ObjectType):
         return queryset
 
     def resolve_all_orders(root, info, **kwargs):  # type: ignore[misc]
-        filters = {
-            "customer__name__icontains": kwargs.get("customer_name"),
-            "products__name__icontains": kwargs.get("product_name"),
-            "products__id": kwargs.get("product_id"),
-            "total_amount__gte": kwargs.get("total_amount_gte"),
-            "total_amount__lte": kwargs.get("total_amount_lte"),
-            "order_date__gte": kwargs.get("order_date_gte"),
-            "order_date__lte": kwargs.get("order_date_lte"),
-        }
-        filters = {k: v for k, v in filters.items() if v is not None}
-        queryset = Order.objects.filter(**filters).distinct()
+        queryset = Order.objects.distinct()
 
         if "order_by" in kwargs:
             queryset = queryset.order_by(kwargs["order_by"])
@@ -323,19 +369,11 @@ class UpdateLowStockProducts(graphene.Mutation):
     @staticmethod
     def mutate(root, info):
         try:
-            # Find products with low stock (< 10)
-            low_stock_products = Product.objects.filter(stock__lt=10)
-
-            updated_products = []
-
-            with transaction.atomic():
-                for product in low_stock_products:
-                    # Increment stock by 10
-                    product.stock += 10
-                    product.save()
-                    updated_products.append(product)
+            # Increment stock by 10 for products with low stock (< 10)
+            updated_ids = bump_low_stock()
+            updated_products = Product.objects.filter(id__in=updated_ids)
 
-            count = len(updated_products)
+            count = len(updated_ids)
             message = f"Successfully updated {count} low-stock products"
 
             # GraphQL mutation return: Pylance warnings about parameters are expected
@@ -0,0 +1,52 @@
+"""
+Database operations shared by the CRM GraphQL schema and scheduled jobs.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from decimal import Decimal
+
+from .models import Customer, Order, Product
+
+LOW_STOCK_THRESHOLD = 10
+RESTOCK_AMOUNT = 10
+
+
+def bump_low_stock():
+    """
+    Restock every product whose stock is below LOW_STOCK_THRESHOLD.
+
+    The increment is applied with a single UPDATE statement instead of
+    saving each product individually.
+
+    Returns:
+        list: IDs of the products that were restocked
+    """
+    with transaction.atomic():
+        ids = list(
+            Product.objects.select_for_update()
+            .filter(stock__lt=LOW_STOCK_THRESHOLD)
+            .values_list("id", flat=True)
+        )
+        if ids:
+            Product.objects.filter(id__in=ids).update(
+                stock=F("stock") + RESTOCK_AMOUNT
+            )
+    return ids
+
+
+def crm_statistics():
+    """
+    Count customers and orders and total the order revenue in SQL.
+
+    Returns:
+        dict: total_customers, total_orders and total_revenue (Decimal)
+    """
+    totals = Order.objects.aggregate(
+        total_orders=Count("id"), total_revenue=Sum("total_amount")
+    )
+    return {
+        "total_customers": Customer.objects.count(),
+        "total_orders": totals["total_orders"],
+        "total_revenue": totals["total_revenue"] or Decimal("0.00"),
+    }
@@ -10,12 +10,14 @@ import sys
 import django
 from datetime import datetime
 from celery import shared_task
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+from django.apps import apps
 
-# Set up Django environment
+# Set up Django environment when run outside an already configured process
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
-django.setup()
+if not apps.ready:
+    django.setup()
+
+from crm import services
 
 
 @shared_task
@@ -24,51 +26,18 @@ def generate_crm_report():
     Generate a weekly CRM report with customer, order, and revenue statistics.
 
     This task:
-    1. Uses GraphQL queries to fetch CRM statistics
+    1. Aggregates CRM statistics directly with the ORM
     2. Logs the report to /tmp/crm_report_log.txt with timestamp
 
     Returns:
         str: Success message with report details
     """
     try:
-        # Set up GraphQL client
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-
-        # GraphQL query to get CRM statistics
-        query = gql(
-            """
-            query GetCRMStatistics {
-                allCustomers {
-                    id
-                }
-                allOrders {
-                    id
-                    totalAmount
-                }
-            }
-        """
-        )
-
-        # Execute the query
-        result = client.execute(query)
-
-        # Extract statistics
-        customers = result.get("allCustomers", [])
-        orders = result.get("allOrders", [])
-
-        total_customers = len(customers)
-        total_orders = len(orders)
-
-        # Calculate total revenue
-        total_revenue = 0.0
-        for order in orders:
-            try:
-                amount = float(order.get("totalAmount", 0))
-                total_revenue += amount
-            except (ValueError, TypeError):
-                # Skip invalid amounts
-                continue
+        # Aggregate the statistics directly in the database
+        stats = services.crm_statistics()
+        total_customers = stats["total_customers"]
+        total_orders = stats["total_orders"]
+        total_revenue = stats["total_revenue"]
 
         # Format the report
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -102,6 +71,24 @@ def generate_crm_report():
         raise Exception(f"CRM Report generation failed: {str(e)}")
 
 
+@shared_task
+def restock_low_stock_products():
+    """
+    Restock low-stock products directly against the database.
+
+    Only the number of updated products is returned; the product rows
+    themselves are never loaded.
+
+    Returns:
+        dict: Count of restocked products and a summary message
+    """
+    count = len(services.bump_low_stock())
+    return {
+        "count": count,
+        "message": f"Successfully updated {count} low-stock products",
+    }
+
+
 @shared_task
 def test_celery_task(message="Default test message"):
     """
@@ -1,48 +1,119 @@
 import os
 import django
 from datetime import datetime
+from decimal import Decimal
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
 django.setup()
 
+from django.db import connection, transaction
+
 from crm.models import Customer, Product, Order
 
 
+def clear_database():
+    """Remove all CRM data in a single transaction."""
+    models = [Order.products.through, Order, Customer, Product]
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # TRUNCATE drops the rows without per-row deletes or cascades
+            tables = ", ".join(
+                connection.ops.quote_name(model._meta.db_table) for model in models
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+        else:
+            for model in models:
+                model.objects.all().delete()
+
+
 def seed_database():
     print("Seeding database...")
 
     # Clear existing data
-    Order.objects.all().delete()
-    Customer.objects.all().delete()
-    Product.objects.all().delete()
+    clear_database()
 
     # Create Customers
-    customer1 = Customer.objects.create(
-        name="John Doe", email="john.doe@example.com", phone="+11234567890"
-    )
-    customer2 = Customer.objects.create(
-        name="Jane Smith", email="jane.smith@example.com", phone="123-456-7890"
+    customers = Customer.objects.bulk_create(
+        [
+            Customer(
+                name="John Doe", email="john.doe@example.com", phone="+11234567890"
+            ),
+            Customer(
+                name="Jane Smith", email="jane.smith@example.com", phone="123-456-7890"
+            ),
+        ]
     )
 
     # Create Products
-    product1 = Product.objects.create(
-        name="Laptop", description="A powerful laptop.", price=1200.00, stock=15
-    )
-    product2 = Product.objects.create(
-        name="Mouse", description="A wireless mouse.", price=25.00, stock=100
-    )
-    product3 = Product.objects.create(
-        name="Keyboard", description="A mechanical keyboard.", price=75.00, stock=50
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name="Laptop",
+                description="A powerful laptop.",
+                price=Decimal("1200.00"),
+                stock=15,
+            ),
+            Product(
+                name="Mouse",
+                description="A wireless mouse.",
+                price=Decimal("25.00"),
+                stock=100,
+            ),
+            Product(
+                name="Keyboard",
+                description="A mechanical keyboard.",
+                price=Decimal("75.00"),
+                stock=50,
+            ),
+        ]
     )
 
-    # Create Orders
-    order1 = Order.objects.create(customer=customer1, order_date=datetime.now())
-    order1.products.add(product1, product2)
-    order1.update_total_amount()
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # The backend left pk unset on the bulk-created rows, so reload them
+        # by their natural keys before they are referenced below
+        by_email = Customer.objects.in_bulk(
+            [customer.email for customer in customers], field_name="email"
+        )
+        customers = [by_email[customer.email] for customer in customers]
+        by_name = {product.name: product for product in Product.objects.all()}
+        products = [by_name[product.name] for product in products]
+
+    customer1, customer2 = customers
+    product1, product2, product3 = products
 
-    order2 = Order.objects.create(customer=customer2, order_date=datetime.now())
-    order2.products.add(product3)
-    order2.update_total_amount()
+    # Create Orders with their totals computed up front
+    order_products = [
+        (customer1, [product1, product2]),
+        (customer2, [product3]),
+    ]
+    orders = Order.objects.bulk_create(
+        [
+            Order(
+                customer=customer,
+                order_date=datetime.now(),
+                total_amount=sum(
+                    (product.price for product in products), Decimal("0.00")
+                ),
+            )
+            for customer, products in order_products
+        ]
+    )
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # Orders have no natural key; the table was just cleared, so the new
+        # rows in primary key order match the insert order
+        orders = list(Order.objects.order_by("pk"))
+
+    # Link orders to their products in one INSERT on the M2M table
+    OrderProduct = Order.products.through
+    OrderProduct.objects.bulk_create(
+        [
+            OrderProduct(order_id=order.pk, product_id=product.pk)
+            for order, (_, products) in zip(orders, order_products)
+            for product in products
+        ]
+    )
 
     print("Database seeding complete.")
 